@@ -4,12 +4,14 @@ Main application entry point.
 """
 
 import os
-from flask import Flask, request, jsonify, send_from_directory
+from flask import Flask, Response, request, jsonify, send_from_directory, stream_with_context
 from flask_cors import CORS
+from flask_compress import Compress
 
 from parsers import parse_text, parse_uploaded_file
 from summarizers import get_summarizer
-from storage import save_summary, get_summary, list_summaries, delete_summary, export_summary
+from tasks import BROKER_URL, celery_app, do_summarize, summarize_document
+from storage import get_summary, list_summaries, delete_summary, export_summary
 
 app = Flask(__name__, static_folder='static')
 CORS(app)
@@ -18,6 +20,14 @@ CORS(app)
 MAX_CONTENT_LENGTH = 16 * 1024 * 1024  # 16MB max file size
 app.config['MAX_CONTENT_LENGTH'] = MAX_CONTENT_LENGTH
 
+# Let a fronting nginx/Apache serve static files (only when one is configured)
+app.config['USE_X_SENDFILE'] = os.environ.get('USE_X_SENDFILE', 'false').lower() == 'true'
+
+# Gzip JSON/text responses; streamed Gemini output is left uncompressed
+# so chunks are flushed to the client as they arrive
+app.config['COMPRESS_STREAMS'] = False
+Compress(app)
+
 
 @app.route('/')
 def index():
@@ -36,11 +46,13 @@ def summarize():
     
     Query params:
         - length: 'short', 'medium', or 'long'
+        - mode: 'local' (default) or 'online' to stream a Gemini summary as plain text
         - save: 'true' to save the summary
     """
     try:
         # Get parameters
         length = request.args.get('length', 'medium')
+        mode = request.args.get('mode', 'local')
         should_save = request.args.get('save', 'false').lower() == 'true'
         
         # Get text from request
@@ -64,36 +76,18 @@ def summarize():
         if not text or not text.strip():
             return jsonify({'error': 'No text provided'}), 400
         
-        # Get local summarizer
-        summarizer = get_summarizer('local')
-        
-        # Generate summary and key points
-        summary = summarizer.summarize(text, length)
-        key_points = summarizer.extract_key_points(text)
+        # Stream Gemini output as it is generated
+        if mode == 'online':
+            summarizer = get_summarizer('online', os.environ.get('GEMINI_API_KEY'))
+            chunks = summarizer.summarize_stream(text, length)
+            return Response(stream_with_context(chunks), mimetype='text/plain')
         
-        result = {
-            'summary': summary,
-            'key_points': key_points,
-            'mode': 'local',
-            'length': length,
-            'filename': filename,
-            'file_type': file_type,
-            'original_length': len(text),
-            'summary_length': len(summary)
-        }
+        # Hand off to a worker when a task queue is configured
+        if BROKER_URL:
+            task = do_summarize.delay(text, length, filename, file_type, should_save)
+            return jsonify({'task_id': task.id, 'status': 'pending'}), 202
         
-        # Save if requested
-        if should_save:
-            summary_id = save_summary(
-                filename=filename,
-                original_text=text,
-                summary=summary,
-                key_points=key_points,
-                mode=mode,
-                length=length,
-                file_type=file_type
-            )
-            result['saved_id'] = summary_id
+        result = summarize_document(text, length, filename, file_type, should_save)
         
         return jsonify(result)
     
@@ -103,6 +97,25 @@ def summarize():
         return jsonify({'error': f'Summarization failed: {str(e)}'}), 500
 
 
+@app.route('/api/summarize/<task_id>', methods=['GET'])
+def summarize_status(task_id):
+    """Poll the result of a queued summarization task."""
+    if not BROKER_URL:
+        return jsonify({'error': 'Task queue is not enabled'}), 404
+    
+    try:
+        task = celery_app.AsyncResult(task_id)
+        
+        if not task.ready():
+            return jsonify({'task_id': task_id, 'status': task.state.lower()}), 202
+        if task.failed():
+            return jsonify({'error': f'Summarization failed: {str(task.result)}'}), 500
+        
+        return jsonify(task.result)
+    except Exception as e:
+        return jsonify({'error': str(e)}), 500
+
+
 @app.route('/api/summaries', methods=['GET'])
 def get_summaries():
     """List all saved summaries."""
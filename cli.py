@@ -7,7 +7,6 @@ import os
 import sys
 
 from parsers import detect_and_parse
-from summarizers import get_summarizer
 from storage import save_summary, get_summary, list_summaries, delete_summary, export_summary
 
 
@@ -51,9 +50,11 @@ def summarize(file_path, mode, length, api_key, save, output):
         
         click.echo(f"🔄 Generating {length} summary using {mode} mode...")
         
+        # Imported here so storage-only commands work without NLTK data
+        from summarizers import get_summarizer
+        
         summarizer = get_summarizer(mode, api_key)
-        summary = summarizer.summarize(text, length)
-        key_points = summarizer.extract_key_points(text)
+        summary, key_points = summarizer.summarize_and_key_points(text, length)
         
         # Display results
         click.echo("\n" + "=" * 60)
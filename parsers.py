@@ -3,8 +3,13 @@ Document Parsers Module
 Handles parsing of text, PDF, and Word documents.
 """
 
+import io
 import os
-from typing import Tuple
+from typing import BinaryIO, Tuple
+
+# WordprocessingML namespace used in word/document.xml
+_W_NS = '{http://schemas.openxmlformats.org/wordprocessingml/2006/main}'
+
 
 def parse_text(content: str) -> str:
     """Parse plain text content."""
@@ -13,8 +18,16 @@ def parse_text(content: str) -> str:
 
 def parse_text_file(file_path: str) -> str:
     """Parse a plain text file."""
-    with open(file_path, 'r', encoding='utf-8', errors='ignore') as f:
-        return f.read().strip()
+    with open(file_path, 'rb') as fp:
+        return parse_text_stream(fp)
+
+
+def parse_text_stream(fp: BinaryIO) -> str:
+    """Parse plain text from a binary file object (UTF-8, universal newlines)."""
+    # Decode the bytes directly rather than wrapping fp in TextIOWrapper, which
+    # needs readable()/seekable() that some upload streams lack before 3.11
+    text = fp.read().decode('utf-8', errors='ignore')
+    return text.replace('\r\n', '\n').replace('\r', '\n').strip()
 
 
 def parse_pdf(file_path: str) -> str:
@@ -24,13 +37,27 @@ def parse_pdf(file_path: str) -> str:
     Args:
         file_path: Path to the PDF file
         
+    Returns:
+        Extracted text from the PDF
+    """
+    with open(file_path, 'rb') as fp:
+        return parse_pdf_stream(fp)
+
+
+def parse_pdf_stream(fp: BinaryIO) -> str:
+    """
+    Parse a PDF from a seekable binary file object.
+    
+    Args:
+        fp: File object positioned at the start of the PDF
+        
     Returns:
         Extracted text from the PDF
     """
     try:
         from PyPDF2 import PdfReader
         
-        reader = PdfReader(file_path)
+        reader = PdfReader(fp)
         text_parts = []
         
         for page in reader.pages:
@@ -51,25 +78,51 @@ def parse_docx(file_path: str) -> str:
     Args:
         file_path: Path to the .docx file
         
+    Returns:
+        Extracted text from the document
+    """
+    with open(file_path, 'rb') as fp:
+        return parse_docx_stream(fp)
+
+
+def parse_docx_stream(fp: BinaryIO) -> str:
+    """
+    Parse a Word document from a seekable binary file object.
+    
+    Args:
+        fp: File object positioned at the start of the .docx
+        
     Returns:
         Extracted text from the document
     """
     try:
-        from docx import Document
+        import zipfile
+        from lxml import etree
         
-        doc = Document(file_path)
         text_parts = []
         
-        for paragraph in doc.paragraphs:
-            if paragraph.text.strip():
-                text_parts.append(paragraph.text)
-        
-        # Also extract text from tables
-        for table in doc.tables:
-            for row in table.rows:
-                for cell in row.cells:
-                    if cell.text.strip():
-                        text_parts.append(cell.text)
+        # Stream word/document.xml and collect each paragraph's text in
+        # document order (body and table cell paragraphs alike)
+        with zipfile.ZipFile(fp) as archive, archive.open('word/document.xml') as xml:
+            # Uploaded XML is untrusted: never expand entities or fetch DTDs (XXE)
+            paragraphs = etree.iterparse(
+                xml,
+                events=('end',),
+                tag=_W_NS + 'p',
+                resolve_entities=False,
+                no_network=True,
+                load_dtd=False
+            )
+            for _, paragraph in paragraphs:
+                text = ''.join(_docx_paragraph_text(paragraph))
+                if text.strip():
+                    text_parts.append(text)
+                
+                # Free parsed elements; clearing also stops nested text box
+                # paragraphs from being read again by their enclosing paragraph
+                paragraph.clear()
+                while paragraph.getprevious() is not None:
+                    del paragraph.getparent()[0]
         
         return '\n'.join(text_parts).strip()
     
@@ -77,6 +130,17 @@ def parse_docx(file_path: str) -> str:
         raise ValueError(f"Failed to parse Word document: {str(e)}")
 
 
+def _docx_paragraph_text(paragraph):
+    """Yield the text pieces of a w:p element (tabs and breaks as \\t and \\n)."""
+    for element in paragraph.iter(_W_NS + 't', _W_NS + 'tab', _W_NS + 'br', _W_NS + 'cr'):
+        if element.tag == _W_NS + 't':
+            yield element.text or ''
+        elif element.tag == _W_NS + 'tab':
+            yield '\t'
+        else:
+            yield '\n'
+
+
 def detect_and_parse(file_path: str) -> Tuple[str, str]:
     """
     Auto-detect file type and parse accordingly.
@@ -117,10 +181,26 @@ def parse_uploaded_file(file_storage, filename: str) -> Tuple[str, str]:
     Returns:
         Tuple of (extracted_text, file_type)
     """
-    import tempfile
-    
     ext = os.path.splitext(filename)[1].lower()
     
+    # Known formats are parsed straight from the upload stream
+    if ext in ['.pdf', '.docx', '.txt', '.md', '.text']:
+        # SpooledTemporaryFile has no seekable() before Python 3.11
+        stream = file_storage.stream
+        seekable = getattr(stream, 'seekable', None)
+        if seekable is not None and seekable():
+            stream.seek(0)
+        else:
+            stream = io.BytesIO(file_storage.read())
+        
+        if ext == '.pdf':
+            return parse_pdf_stream(stream), 'pdf'
+        if ext == '.docx':
+            return parse_docx_stream(stream), 'docx'
+        return parse_text_stream(stream), 'text'
+    
+    import tempfile
+    
     # Create temporary file
     with tempfile.NamedTemporaryFile(delete=False, suffix=ext) as tmp:
         file_storage.save(tmp.name)
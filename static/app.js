@@ -9,6 +9,12 @@ const state = {
     currentResult: null
 };
 
+// Delay between polls when a summary is queued on a background worker (ms)
+const TASK_POLL_INTERVAL = 1000;
+// Give up on a queued summary after this many polls (unknown or expired
+// task ids are reported as pending forever)
+const TASK_POLL_MAX_ATTEMPTS = 180;
+
 // DOM Elements
 const elements = {
     // Tabs
@@ -205,7 +211,18 @@ async function handleSummarize() {
             });
         }
 
-        const data = await response.json();
+        let data = await response.json();
+
+        // Queued on a background worker: poll until the result is ready
+        let attempts = 0;
+        while (response.status === 202 && data.task_id) {
+            if (++attempts > TASK_POLL_MAX_ATTEMPTS) {
+                throw new Error('Summarization timed out. Please try again later.');
+            }
+            await new Promise(resolve => setTimeout(resolve, TASK_POLL_INTERVAL));
+            response = await fetch(`/api/summarize/${data.task_id}`);
+            data = await response.json();
+        }
 
         if (!response.ok) {
             throw new Error(data.error || 'Summarization failed');
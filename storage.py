@@ -6,29 +6,86 @@ SQLite-based persistence for summaries.
 import os
 import sqlite3
 import json
+import threading
 from datetime import datetime
-from typing import List, Dict, Optional
+from itertools import chain
+from typing import List, Dict, Optional, Tuple
 
 DATABASE_PATH = os.path.join(os.path.dirname(__file__), 'summaries.db')
 
+# Key points are stored as a single unit-separator-delimited string
+KEY_POINTS_SEP = '\x1f'
 
-def get_connection():
-    """Get a database connection."""
-    conn = sqlite3.connect(DATABASE_PATH)
+
+INSERT_SUMMARY_SQL = '''
+    INSERT INTO summaries (filename, summary, key_points, mode, length, file_type)
+    VALUES (?, ?, ?, ?, ?, ?)
+'''
+INSERT_TEXT_SQL = 'INSERT INTO summaries_text (id, original_text) VALUES (?, ?)'
+
+_local = threading.local()
+_init_lock = threading.Lock()
+_init_done = False
+
+
+def _connect():
+    """Open a new tuned database connection."""
+    conn = sqlite3.connect(
+        DATABASE_PATH,
+        check_same_thread=False,
+        isolation_level=None,
+        cached_statements=256
+    )
     conn.row_factory = sqlite3.Row
+    # Per-connection tuning; journal_mode is persisted by init_db()
+    conn.execute('PRAGMA synchronous=NORMAL')
+    conn.execute('PRAGMA temp_store=MEMORY')
+    conn.execute('PRAGMA mmap_size=268435456')
+    conn.execute('PRAGMA cache_size=-20000')
+    return conn
+
+
+def get_connection():
+    """Get the cached database connection for the current thread."""
+    conn = getattr(_local, 'conn', None)
+    if conn is None:
+        conn = _connect()
+        _local.conn = conn
     return conn
 
 
 def init_db():
-    """Initialize the database schema."""
-    conn = get_connection()
-    cursor = conn.cursor()
+    """
+    Initialize the database schema (runs once per process).
+    
+    Uses its own short-lived connection rather than the per-thread cache:
+    this runs at import, and under `gunicorn --preload` or Celery prefork
+    no SQLite handle may be open in the parent when workers fork.
+    """
+    global _init_done
     
+    with _init_lock:
+        if _init_done:
+            return
+        
+        conn = _connect()
+        try:
+            _create_schema(conn.cursor())
+        finally:
+            conn.close()
+        
+        _init_done = True
+
+
+def _create_schema(cursor):
+    """Create tables and indexes and migrate older databases."""
+    # WAL lets readers proceed while a write is in progress
+    cursor.execute('PRAGMA journal_mode=WAL')
+
     cursor.execute('''
         CREATE TABLE IF NOT EXISTS summaries (
             id INTEGER PRIMARY KEY AUTOINCREMENT,
             filename TEXT,
-            original_text TEXT,
             summary TEXT,
             key_points TEXT,
             mode TEXT,
@@ -38,8 +95,52 @@ def init_db():
         )
     ''')
     
-    conn.commit()
-    conn.close()
+    # Full document bodies live in a side table so list queries
+    # only touch the small summary rows
+    cursor.execute('''
+        CREATE TABLE IF NOT EXISTS summaries_text (
+            id INTEGER PRIMARY KEY,
+            original_text TEXT
+        )
+    ''')
+    
+    cursor.execute('''
+        CREATE INDEX IF NOT EXISTS idx_summaries_created
+        ON summaries(created_at DESC)
+    ''')
+    
+    # Move bodies out of databases created before the side table existed
+    columns = [row['name'] for row in cursor.execute('PRAGMA table_info(summaries)')]
+    if 'original_text' in columns:
+        cursor.execute('BEGIN')
+        try:
+            cursor.execute('''
+                INSERT OR IGNORE INTO summaries_text (id, original_text)
+                SELECT id, original_text FROM summaries WHERE original_text IS NOT NULL
+            ''')
+            cursor.execute('UPDATE summaries SET original_text = NULL WHERE original_text IS NOT NULL')
+            cursor.execute('COMMIT')
+        except Exception:
+            cursor.execute('ROLLBACK')
+            raise
+    
+    # Schema version 1: key_points switched from JSON arrays to KEY_POINTS_SEP
+    user_version = cursor.execute('PRAGMA user_version').fetchone()[0]
+    if user_version < 1:
+        cursor.execute('BEGIN')
+        try:
+            cursor.execute('''
+                UPDATE summaries SET key_points = (
+                    SELECT coalesce(group_concat(value, char(31)), '')
+                    FROM json_each(summaries.key_points)
+                )
+                WHERE json_valid(key_points) AND json_type(key_points) = 'array'
+            ''')
+            cursor.execute('PRAGMA user_version = 1')
+            cursor.execute('COMMIT')
+        except Exception:
+            cursor.execute('ROLLBACK')
+            raise
 
 
 def save_summary(
@@ -57,22 +158,64 @@ def save_summary(
     Returns:
         ID of the saved summary
     """
-    init_db()
     conn = get_connection()
     cursor = conn.cursor()
     
-    cursor.execute('''
-        INSERT INTO summaries (filename, original_text, summary, key_points, mode, length, file_type)
-        VALUES (?, ?, ?, ?, ?, ?, ?)
-    ''', (filename, original_text, summary, json.dumps(key_points), mode, length, file_type))
-    
-    summary_id = cursor.lastrowid
-    conn.commit()
-    conn.close()
+    cursor.execute('BEGIN')
+    try:
+        cursor.execute(
+            INSERT_SUMMARY_SQL,
+            (filename, summary, KEY_POINTS_SEP.join(key_points), mode, length, file_type)
+        )
+        
+        summary_id = cursor.lastrowid
+        cursor.execute(INSERT_TEXT_SQL, (summary_id, original_text))
+        cursor.execute('COMMIT')
+    except Exception:
+        cursor.execute('ROLLBACK')
+        raise
     
     return summary_id
 
 
+def save_summaries_bulk(rows: List[Tuple]) -> List[int]:
+    """
+    Save many summaries in a single transaction.
+    
+    Args:
+        rows: Tuples of (filename, original_text, summary, key_points,
+              mode, length, file_type), in save_summary() argument order
+        
+    Returns:
+        IDs of the saved summaries, in input order
+    """
+    conn = get_connection()
+    cursor = conn.cursor()
+    
+    summary_ids = []
+    cursor.execute('BEGIN')
+    try:
+        # Each row needs its own lastrowid for the text table, so summaries
+        # are inserted one by one (the statement is parsed once and cached)
+        for filename, _, summary, key_points, mode, length, file_type in rows:
+            cursor.execute(
+                INSERT_SUMMARY_SQL,
+                (filename, summary, KEY_POINTS_SEP.join(key_points), mode, length, file_type)
+            )
+            summary_ids.append(cursor.lastrowid)
+        
+        cursor.executemany(
+            INSERT_TEXT_SQL,
+            ((summary_id, row[1]) for summary_id, row in zip(summary_ids, rows))
+        )
+        cursor.execute('COMMIT')
+    except Exception:
+        cursor.execute('ROLLBACK')
+        raise
+    
+    return summary_ids
+
+
 def get_summary(summary_id: int) -> Optional[Dict]:
     """
     Get a specific summary by ID.
@@ -80,13 +223,17 @@ def get_summary(summary_id: int) -> Optional[Dict]:
     Returns:
         Summary dictionary or None if not found
     """
-    init_db()
     conn = get_connection()
     cursor = conn.cursor()
     
-    cursor.execute('SELECT * FROM summaries WHERE id = ?', (summary_id,))
+    cursor.execute('''
+        SELECT s.id, s.filename, t.original_text, s.summary, s.key_points,
+               s.mode, s.length, s.file_type, s.created_at
+        FROM summaries s
+        LEFT JOIN summaries_text t ON t.id = s.id
+        WHERE s.id = ?
+    ''', (summary_id,))
     row = cursor.fetchone()
-    conn.close()
     
     if row:
         return dict_from_row(row)
@@ -100,7 +247,6 @@ def list_summaries(limit: int = 50) -> List[Dict]:
     Returns:
         List of summary dictionaries (without full text for brevity)
     """
-    init_db()
     conn = get_connection()
     cursor = conn.cursor()
     
@@ -113,7 +259,6 @@ def list_summaries(limit: int = 50) -> List[Dict]:
     ''', (limit,))
     
     rows = cursor.fetchall()
-    conn.close()
     
     return [dict(row) for row in rows]
 
@@ -125,15 +270,18 @@ def delete_summary(summary_id: int) -> bool:
     Returns:
         True if deleted, False if not found
     """
-    init_db()
     conn = get_connection()
     cursor = conn.cursor()
     
-    cursor.execute('DELETE FROM summaries WHERE id = ?', (summary_id,))
-    deleted = cursor.rowcount > 0
-    
-    conn.commit()
-    conn.close()
+    cursor.execute('BEGIN')
+    try:
+        cursor.execute('DELETE FROM summaries WHERE id = ?', (summary_id,))
+        deleted = cursor.rowcount > 0
+        cursor.execute('DELETE FROM summaries_text WHERE id = ?', (summary_id,))
+        cursor.execute('COMMIT')
+    except Exception:
+        cursor.execute('ROLLBACK')
+        raise
     
     return deleted
 
@@ -141,14 +289,29 @@ def delete_summary(summary_id: int) -> bool:
 def dict_from_row(row) -> Dict:
     """Convert a database row to a dictionary."""
     data = dict(row)
-    if 'key_points' in data and data['key_points']:
-        try:
-            data['key_points'] = json.loads(data['key_points'])
-        except json.JSONDecodeError:
-            data['key_points'] = []
+    if 'key_points' in data:
+        key_points = data['key_points']
+        data['key_points'] = key_points.split(KEY_POINTS_SEP) if key_points else []
     return data
 
 
+def _get_summary_for_export(summary_id: int) -> Optional[Dict]:
+    """Get only the columns used by the plain text export."""
+    conn = get_connection()
+    cursor = conn.cursor()
+    
+    cursor.execute('''
+        SELECT filename, created_at, mode, length, summary, key_points
+        FROM summaries
+        WHERE id = ?
+    ''', (summary_id,))
+    row = cursor.fetchone()
+    
+    if row:
+        return dict_from_row(row)
+    return None
+
+
 def export_summary(summary_id: int, format: str = 'txt') -> Optional[str]:
     """
     Export a summary in the specified format.
@@ -160,15 +323,18 @@ def export_summary(summary_id: int, format: str = 'txt') -> Optional[str]:
     Returns:
         Formatted string or None if not found
     """
-    summary = get_summary(summary_id)
-    if not summary:
-        return None
-    
     if format == 'json':
+        summary = get_summary(summary_id)
+        if not summary:
+            return None
         return json.dumps(summary, indent=2, default=str)
     
+    summary = _get_summary_for_export(summary_id)
+    if not summary:
+        return None
+    
     # Plain text format
-    lines = [
+    header_lines = [
         f"Document: {summary['filename']}",
         f"Date: {summary['created_at']}",
         f"Mode: {summary['mode']} | Length: {summary['length']}",
@@ -183,7 +349,9 @@ def export_summary(summary_id: int, format: str = 'txt') -> Optional[str]:
         "=" * 50,
     ]
     
-    for i, point in enumerate(summary.get('key_points', []), 1):
-        lines.append(f"{i}. {point}")
+    key_point_lines = (f"{i}. {point}" for i, point in enumerate(summary.get('key_points', []), 1))
     
-    return '\n'.join(lines)
+    return '\n'.join(chain(header_lines, key_point_lines))
+
+
+init_db()
@@ -3,36 +3,117 @@ Summarization Engines Module
 Provides local (extractive) and online (AI-powered) summarization.
 """
 
+import hashlib
 import re
-from typing import List, Optional
+import threading
+from collections import OrderedDict
+from typing import Iterator, List, Optional, Tuple
 
+import nltk
+from sumy.parsers.plaintext import PlaintextParser
+from sumy.nlp.tokenizers import Tokenizer
+from fast_textrank import FastTextRankSummarizer
+from sumy.summarizers.lsa import LsaSummarizer
+from sumy.nlp.stemmers import Stemmer
+from sumy.utils import get_stop_words
 
-class LocalSummarizer:
+
+def _ensure_nltk_data():
+    """Download required NLTK data if it is missing."""
+    required_packages = ['punkt', 'punkt_tab', 'stopwords']
+    for package in required_packages:
+        try:
+            nltk.data.find(f'tokenizers/{package}' if 'punkt' in package else f'corpora/{package}')
+        except LookupError:
+            nltk.download(package, quiet=True)
+
+
+# NLTK data and sumy helpers are loaded once per process, not per request
+_ensure_nltk_data()
+_STOP_WORDS = get_stop_words("english")
+_STEMMER = Stemmer("english")
+_TOKENIZER = Tokenizer("english")
+
+# Leading bullet markers in Gemini key point output
+_BULLET_RE = re.compile(r'^[•\-\*]\s*')
+
+# LRU of local results keyed by (content hash, kind, option) so that
+# re-submitting the same document skips TextRank/LSA entirely
+_RESULT_CACHE_SIZE = 128
+_result_cache = OrderedDict()
+_result_cache_lock = threading.Lock()
+
+
+def _text_key(text: str) -> str:
+    """Hash document text into a compact cache key."""
+    return hashlib.blake2b(text.encode('utf-8'), digest_size=16).hexdigest()
+
+
+def _cache_get(key):
+    """Look up a cached result, marking it as recently used."""
+    with _result_cache_lock:
+        value = _result_cache.get(key)
+        if value is not None:
+            _result_cache.move_to_end(key)
+        return value
+
+
+def _cache_put(key, value):
+    """Store a result, evicting the least recently used entry if full."""
+    with _result_cache_lock:
+        _result_cache[key] = value
+        _result_cache.move_to_end(key)
+        if len(_result_cache) > _RESULT_CACHE_SIZE:
+            _result_cache.popitem(last=False)
+
+
+# Character budget for document text sent to Gemini
+PROMPT_CHAR_BUDGET = 8000
+# Above this many sentences the dense TextRank matrix is too large to build
+# just for prompt condensing, so head+tail slicing is used instead
+_CONDENSE_MAX_SENTENCES = 1000
+
+
+def _condense(text: str, budget: int = PROMPT_CHAR_BUDGET) -> str:
     """
-    Local extractive summarizer using TextRank algorithm.
-    Works offline without any API keys.
+    Shrink text to fit a prompt budget.
+    
+    Keeps the highest-ranked TextRank sentences in document order, falling
+    back to the head and tail of the text for very long or unsplittable input.
     """
+    if len(text) <= budget:
+        return text
     
-    def __init__(self):
-        self._initialized = False
-        self._nlp_ready = False
+    document = PlaintextParser.from_string(text, _TOKENIZER).document
+    sentences = document.sentences
     
-    def _initialize(self):
-        """Initialize NLTK components on first use."""
-        if self._initialized:
-            return
+    if 0 < len(sentences) <= _CONDENSE_MAX_SENTENCES:
+        summarizer = FastTextRankSummarizer(_STEMMER)
+        summarizer.stop_words = _STOP_WORDS
+        ratings = summarizer.rate_sentences(document)
         
-        import nltk
+        ranked = sorted(range(len(sentences)), key=lambda i: ratings[sentences[i]], reverse=True)
+        chosen = []
+        used = 0
+        for i in ranked:
+            size = len(str(sentences[i])) + 1
+            if used + size <= budget:
+                chosen.append(i)
+                used += size
         
-        # Download required NLTK data
-        required_packages = ['punkt', 'punkt_tab', 'stopwords']
-        for package in required_packages:
-            try:
-                nltk.data.find(f'tokenizers/{package}' if 'punkt' in package else f'corpora/{package}')
-            except LookupError:
-                nltk.download(package, quiet=True)
-        
-        self._initialized = True
+        if chosen:
+            return ' '.join(str(sentences[i]) for i in sorted(chosen))
+    
+    separator = "\n...\n"
+    half = (budget - len(separator)) // 2
+    return text[:half] + separator + text[-half:]
+
+
+class LocalSummarizer:
+    """
+    Local extractive summarizer using TextRank algorithm.
+    Works offline without any API keys.
+    """
     
     def summarize(self, text: str, length: str = 'medium') -> str:
         """
@@ -45,14 +126,66 @@ class LocalSummarizer:
         Returns:
             Summarized text
         """
-        self._initialize()
+        cache_key = (_text_key(text), 'summary', length)
+        summary = _cache_get(cache_key)
+        if summary is None:
+            document = PlaintextParser.from_string(text, _TOKENIZER).document
+            summary = self._summarize_document(document, text, length)
+            _cache_put(cache_key, summary)
+        return summary
+    
+    def extract_key_points(self, text: str, max_points: int = 5) -> List[str]:
+        """
+        Extract key points from text.
+        
+        Args:
+            text: Input text
+            max_points: Maximum number of key points
+            
+        Returns:
+            List of key point strings
+        """
+        cache_key = (_text_key(text), 'key_points', max_points)
+        key_points = _cache_get(cache_key)
+        if key_points is None:
+            document = PlaintextParser.from_string(text, _TOKENIZER).document
+            key_points = tuple(self._key_points_from_document(document, text, max_points))
+            _cache_put(cache_key, key_points)
+        return list(key_points)
+    
+    def summarize_and_key_points(self, text: str, length: str = 'medium',
+                                 max_points: int = 5) -> Tuple[str, List[str]]:
+        """
+        Generate a summary and key points, parsing the text only once.
+        
+        Args:
+            text: Input text to summarize
+            length: 'short', 'medium', or 'long'
+            max_points: Maximum number of key points
+            
+        Returns:
+            Tuple of (summary, key_points)
+        """
+        text_key = _text_key(text)
+        summary_key = (text_key, 'summary', length)
+        key_points_key = (text_key, 'key_points', max_points)
         
-        from sumy.parsers.plaintext import PlaintextParser
-        from sumy.nlp.tokenizers import Tokenizer
-        from sumy.summarizers.text_rank import TextRankSummarizer
-        from sumy.nlp.stemmers import Stemmer
-        from sumy.utils import get_stop_words
+        summary = _cache_get(summary_key)
+        key_points = _cache_get(key_points_key)
         
+        if summary is None or key_points is None:
+            document = PlaintextParser.from_string(text, _TOKENIZER).document
+            if summary is None:
+                summary = self._summarize_document(document, text, length)
+                _cache_put(summary_key, summary)
+            if key_points is None:
+                key_points = tuple(self._key_points_from_document(document, text, max_points))
+                _cache_put(key_points_key, key_points)
+        
+        return summary, list(key_points)
+    
+    def _summarize_document(self, document, text: str, length: str) -> str:
+        """Run TextRank over an already parsed document."""
         # Determine sentence count based on length
         sentence_counts = {
             'short': 3,
@@ -61,42 +194,24 @@ class LocalSummarizer:
         }
         sentence_count = sentence_counts.get(length, 5)
         
-        # Parse and summarize
-        parser = PlaintextParser.from_string(text, Tokenizer("english"))
-        stemmer = Stemmer("english")
-        summarizer = TextRankSummarizer(stemmer)
-        summarizer.stop_words = get_stop_words("english")
+        summarizer = FastTextRankSummarizer(_STEMMER)
+        summarizer.stop_words = _STOP_WORDS
         
-        sentences = summarizer(parser.document, sentence_count)
+        sentences = summarizer(document, sentence_count)
         summary = ' '.join(str(sentence) for sentence in sentences)
         
         return summary if summary else text[:500] + "..."
     
-    def extract_key_points(self, text: str, max_points: int = 5) -> List[str]:
-        """
-        Extract key points from text.
-        
-        Args:
-            text: Input text
-            max_points: Maximum number of key points
-            
-        Returns:
-            List of key point strings
-        """
-        self._initialize()
+    def _key_points_from_document(self, document, text: str, max_points: int) -> List[str]:
+        """Run LSA over an already parsed document."""
+        sentences = document.sentences
         
-        from sumy.parsers.plaintext import PlaintextParser
-        from sumy.nlp.tokenizers import Tokenizer
-        from sumy.summarizers.lsa import LsaSummarizer
-        from sumy.nlp.stemmers import Stemmer
-        from sumy.utils import get_stop_words
+        # With max_points or fewer sentences LSA would pick them all, so skip the SVD
+        if len(sentences) > max_points:
+            summarizer = LsaSummarizer(_STEMMER)
+            summarizer.stop_words = _STOP_WORDS
+            sentences = summarizer(document, max_points)
         
-        parser = PlaintextParser.from_string(text, Tokenizer("english"))
-        stemmer = Stemmer("english")
-        summarizer = LsaSummarizer(stemmer)
-        summarizer.stop_words = get_stop_words("english")
-        
-        sentences = summarizer(parser.document, max_points)
         key_points = [str(sentence).strip() for sentence in sentences]
         
         return key_points if key_points else [text[:200] + "..."]
@@ -135,24 +250,77 @@ class OnlineSummarizer:
         Returns:
             AI-generated summary
         """
+        return self._generate_summary(_condense(text), length)
+    
+    def _generate_summary(self, body: str, length: str) -> str:
+        """Summarize already condensed text with Gemini."""
+        model = self._get_model()
+        
+        response = model.generate_content(self._summary_prompt(body, length))
+        return response.text.strip()
+    
+    def summarize_stream(self, text: str, length: str = 'medium') -> Iterator[str]:
+        """
+        Generate a summary using Gemini AI, yielding text as it arrives.
+        
+        Args:
+            text: Input text to summarize
+            length: 'short', 'medium', or 'long'
+            
+        Returns:
+            Iterator over chunks of the AI-generated summary
+        """
+        # Resolve the model and start the request up front so that
+        # configuration errors surface before any chunk is sent
         model = self._get_model()
+        response = model.generate_content(self._summary_prompt(_condense(text), length), stream=True)
         
+        return self._stream_text(response)
+    
+    @staticmethod
+    def _stream_text(response) -> Iterator[str]:
+        """
+        Yield text from streamed Gemini chunks.
+        
+        Chunks without parts (a blocked prompt, a safety stop or a bare
+        finish_reason chunk) would make chunk.text raise mid-stream, after
+        the HTTP status has been sent, so they are checked explicitly and
+        an error marker is yielded if generation stopped abnormally.
+        """
+        for chunk in response:
+            candidates = chunk.candidates
+            if not candidates:
+                block_reason = getattr(chunk.prompt_feedback, 'block_reason', None)
+                reason = getattr(block_reason, 'name', block_reason) or 'no candidates returned'
+                yield f"\n\n[Summary unavailable: {reason}]"
+                return
+            
+            candidate = candidates[0]
+            parts = candidate.content.parts if candidate.content else []
+            text = ''.join(getattr(part, 'text', '') for part in parts)
+            if text:
+                yield text
+            
+            finish_reason = getattr(candidate.finish_reason, 'name', candidate.finish_reason)
+            if finish_reason not in (None, 0, 'FINISH_REASON_UNSPECIFIED', 'STOP', 'MAX_TOKENS'):
+                yield f"\n\n[Summary stopped early: {finish_reason}]"
+                return
+    
+    def _summary_prompt(self, body: str, length: str) -> str:
+        """Build the Gemini prompt for a summary of the given length from condensed text."""
         length_instructions = {
             'short': 'in 2-3 sentences',
             'medium': 'in 4-6 sentences',
             'long': 'in a detailed paragraph of 8-10 sentences'
         }
         
-        prompt = f"""Summarize the following text {length_instructions.get(length, 'in 4-6 sentences')}. 
+        return f"""Summarize the following text {length_instructions.get(length, 'in 4-6 sentences')}. 
 Focus on the main ideas and key information. Be concise and clear.
 
 TEXT:
-{text[:10000]}
+{body}
 
 SUMMARY:"""
-        
-        response = model.generate_content(prompt)
-        return response.text.strip()
     
     def extract_key_points(self, text: str, max_points: int = 5) -> List[str]:
         """
@@ -165,6 +333,10 @@ SUMMARY:"""
         Returns:
             List of key point strings
         """
+        return self._generate_key_points(_condense(text), max_points)
+    
+    def _generate_key_points(self, body: str, max_points: int) -> List[str]:
+        """Extract key points from already condensed text with Gemini."""
         model = self._get_model()
         
         prompt = f"""Extract exactly {max_points} key points from the following text.
@@ -172,7 +344,7 @@ Format each point as a clear, concise bullet point.
 Return ONLY the bullet points, one per line, starting with "•".
 
 TEXT:
-{text[:10000]}
+{body}
 
 KEY POINTS:"""
         
@@ -185,11 +357,34 @@ KEY POINTS:"""
         for line in lines:
             line = line.strip()
             # Remove bullet point markers
-            line = re.sub(r'^[•\-\*]\s*', '', line)
+            line = _BULLET_RE.sub('', line)
             if line and len(key_points) < max_points:
                 key_points.append(line)
         
         return key_points if key_points else [response.text.strip()]
+    
+    def summarize_and_key_points(self, text: str, length: str = 'medium',
+                                 max_points: int = 5) -> Tuple[str, List[str]]:
+        """
+        Generate a summary and key points.
+        
+        Args:
+            text: Input text to summarize
+            length: 'short', 'medium', or 'long'
+            max_points: Maximum number of key points
+            
+        Returns:
+            Tuple of (summary, key_points)
+        """
+        # Condense once and share the result between both prompts
+        body = _condense(text)
+        return self._generate_summary(body, length), self._generate_key_points(body, max_points)
+
+
+# LocalSummarizer is stateless, so one instance serves the whole process.
+# Building it (and the NLTK/sumy globals above) at import lets
+# `gunicorn --preload` share the loaded data with forked workers.
+_LOCAL_SINGLETON = LocalSummarizer()
 
 
 def get_summarizer(mode: str = 'local', api_key: Optional[str] = None):
@@ -201,8 +396,8 @@ def get_summarizer(mode: str = 'local', api_key: Optional[str] = None):
         api_key: API key for online mode
         
     Returns:
-        Summarizer instance
+        Summarizer instance (the shared LocalSummarizer for local mode)
     """
     if mode == 'online':
         return OnlineSummarizer(api_key)
-    return LocalSummarizer()
+    return _LOCAL_SINGLETON
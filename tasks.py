@@ -0,0 +1,83 @@
+"""
+Background Tasks Module
+Celery tasks for running summarization outside the web request.
+"""
+
+import os
+from typing import Dict
+
+from summarizers import get_summarizer
+from storage import save_summary
+
+# Summarization is queued only when a broker is configured
+BROKER_URL = os.environ.get('CELERY_BROKER_URL')
+RESULT_BACKEND = os.environ.get('CELERY_RESULT_BACKEND', BROKER_URL)
+
+
+def summarize_document(
+    text: str,
+    length: str,
+    filename: str,
+    file_type: str,
+    should_save: bool = False
+) -> Dict:
+    """
+    Summarize text and optionally save the result.
+    
+    Args:
+        text: Input text to summarize
+        length: 'short', 'medium', or 'long'
+        filename: Original document name
+        file_type: 'pdf', 'docx', or 'text'
+        should_save: Save the summary to the database
+    
+    Returns:
+        Result dictionary as returned by /api/summarize
+    """
+    mode = 'local'
+    summarizer = get_summarizer(mode)
+    
+    # Generate summary and key points
+    summary, key_points = summarizer.summarize_and_key_points(text, length)
+    
+    result = {
+        'summary': summary,
+        'key_points': key_points,
+        'mode': mode,
+        'length': length,
+        'filename': filename,
+        'file_type': file_type,
+        'original_length': len(text),
+        'summary_length': len(summary)
+    }
+    
+    # Save if requested
+    if should_save:
+        summary_id = save_summary(
+            filename=filename,
+            original_text=text,
+            summary=summary,
+            key_points=key_points,
+            mode=mode,
+            length=length,
+            file_type=file_type
+        )
+        result['saved_id'] = summary_id
+    
+    return result
+
+
+# Celery is only required (and imported) when a broker is configured
+celery_app = None
+do_summarize = None
+
+if BROKER_URL:
+    from celery import Celery
+    
+    celery_app = Celery('summarizer', broker=BROKER_URL, backend=RESULT_BACKEND)
+    
+    @celery_app.task
+    def do_summarize(text: str, length: str, filename: str, file_type: str,
+                     should_save: bool = False) -> Dict:
+        """Celery task wrapper around summarize_document()."""
+        return summarize_document(text, length, filename, file_type, should_save)
@@ -0,0 +1,109 @@
+"""
+Tests for the document parsers.
+"""
+
+import io
+import os
+import sys
+import tempfile
+import zipfile
+
+import pytest
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+pytest.importorskip('lxml')
+
+from parsers import parse_docx_stream, parse_uploaded_file
+
+W_NS = 'http://schemas.openxmlformats.org/wordprocessingml/2006/main'
+
+
+def make_docx(document_xml: str) -> io.BytesIO:
+    """Build a minimal in-memory .docx containing only word/document.xml."""
+    buffer = io.BytesIO()
+    with zipfile.ZipFile(buffer, 'w') as archive:
+        archive.writestr('word/document.xml', document_xml)
+    buffer.seek(0)
+    return buffer
+
+
+def test_parse_docx_stream_extracts_paragraphs_and_tables():
+    docx = make_docx(f'''<?xml version="1.0"?>
+<w:document xmlns:w="{W_NS}"><w:body>
+<w:p><w:r><w:t>Hello </w:t></w:r><w:r><w:t>world.</w:t><w:tab/><w:t>tabbed</w:t></w:r></w:p>
+<w:p></w:p>
+<w:tbl><w:tr>
+<w:tc><w:p><w:r><w:t>Cell A</w:t></w:r></w:p></w:tc>
+<w:tc><w:p><w:r><w:t>Cell B</w:t><w:br/><w:t>line 2</w:t></w:r></w:p></w:tc>
+</w:tr></w:tbl>
+</w:body></w:document>''')
+    
+    assert parse_docx_stream(docx) == 'Hello world.\ttabbed\nCell A\nCell B\nline 2'
+
+
+def test_parse_docx_stream_does_not_resolve_external_entities(tmp_path):
+    secret = tmp_path / 'secret.txt'
+    secret.write_text('TOP-SECRET-VALUE')
+    
+    docx = make_docx(f'''<?xml version="1.0"?>
+<!DOCTYPE w:document [<!ENTITY x SYSTEM "{secret.as_uri()}">]>
+<w:document xmlns:w="{W_NS}"><w:body>
+<w:p><w:r><w:t>Before &x; after</w:t></w:r></w:p>
+</w:body></w:document>''')
+    
+    text = parse_docx_stream(docx)
+    
+    assert 'TOP-SECRET-VALUE' not in text
+    assert 'Before' in text
+
+
+def test_parse_docx_stream_rejects_non_zip_input():
+    with pytest.raises(ValueError):
+        parse_docx_stream(io.BytesIO(b'not a docx'))
+
+
+def make_upload(data: bytes, filename: str):
+    """Build a FileStorage backed by a SpooledTemporaryFile, as Werkzeug does."""
+    from werkzeug.datastructures import FileStorage
+    
+    stream = tempfile.SpooledTemporaryFile(max_size=500 * 1024)
+    stream.write(data)
+    stream.seek(0)
+    return FileStorage(stream=stream, filename=filename)
+
+
+def test_parse_uploaded_file_reads_spooled_text_upload():
+    pytest.importorskip('werkzeug')
+    upload = make_upload(b'Hello world.\r\nSecond line.\r\n', 'notes.txt')
+    
+    assert parse_uploaded_file(upload, 'notes.txt') == ('Hello world.\nSecond line.', 'text')
+
+
+def test_parse_uploaded_file_handles_stream_without_seekable():
+    pytest.importorskip('werkzeug')
+    from werkzeug.datastructures import FileStorage
+    
+    class LegacyStream:
+        """Mimics SpooledTemporaryFile before Python 3.11 (no seekable/readable)."""
+        
+        def __init__(self, data):
+            self._buffer = io.BytesIO(data)
+        
+        def read(self, *args):
+            return self._buffer.read(*args)
+    
+    upload = FileStorage(stream=LegacyStream(b'Line one.\rLine two.'), filename='notes.md')
+    
+    assert parse_uploaded_file(upload, 'notes.md') == ('Line one.\nLine two.', 'text')
+
+
+def test_parse_uploaded_file_reads_spooled_docx_upload():
+    pytest.importorskip('werkzeug')
+    docx = make_docx(f'''<?xml version="1.0"?>
+<w:document xmlns:w="{W_NS}"><w:body>
+<w:p><w:r><w:t>Uploaded paragraph.</w:t></w:r></w:p>
+</w:body></w:document>''')
+    upload = make_upload(docx.getvalue(), 'report.docx')
+    
+    assert parse_uploaded_file(upload, 'report.docx') == ('Uploaded paragraph.', 'docx')
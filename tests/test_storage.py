@@ -0,0 +1,47 @@
+"""
+Tests for the SQLite storage layer.
+"""
+
+import os
+import sys
+
+import pytest
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import storage
+
+
+@pytest.fixture
+def fresh_db(tmp_path, monkeypatch):
+    """Point storage at an empty database with no cached connection."""
+    monkeypatch.setattr(storage, 'DATABASE_PATH', str(tmp_path / 'summaries.db'))
+    monkeypatch.setattr(storage, '_init_done', False)
+    monkeypatch.setattr(storage, '_local', storage.threading.local())
+    return tmp_path
+
+
+def test_init_db_leaves_no_open_connection(fresh_db):
+    storage.init_db()
+    
+    # Nothing may be inherited by workers forked after import
+    assert getattr(storage._local, 'conn', None) is None
+    assert (fresh_db / 'summaries.db').exists()
+
+
+@pytest.mark.skipif(not hasattr(os, 'fork'), reason='requires os.fork')
+def test_child_process_after_init_can_write(fresh_db):
+    storage.init_db()
+    
+    pid = os.fork()
+    if pid == 0:
+        try:
+            summary_id = storage.save_summary('a.txt', 'text', 'summary', ['one'], 'local', 'short', 'text')
+            os._exit(0 if storage.get_summary(summary_id) else 1)
+        except BaseException:
+            os._exit(1)
+    _, status = os.waitpid(pid, 0)
+    
+    assert os.WEXITSTATUS(status) == 0
+    summary = storage.get_summary(1)
+    assert summary['key_points'] == ['one']